@@ -1,7 +1,21 @@
 import os
 import csv
+from operator import itemgetter
 from dataclasses import dataclass, field
-from typing import Dict, Set, List
+from typing import Dict, Set, List, Optional, Sequence
+
+from external_sort import external_sort, DEFAULT_MEMORY_LIMIT
+
+INVADER_INFO_FIELDS = ['country_code', 'invader_species', 'role', 'email']
+INVADER_INFO_HEADER = ['Country_Code', 'Invader_Species', 'Role', 'Email']
+DD_MONSTERS = ['d&d_beholder', 'd&d_devil', 'd&d_lich', 'd&d_mind_flayer', 'd&d_vampire',
+               'd&d_red_dragon', 'd&d_hill_giant', 'd&d_treant', 'd&d_werewolf', 'd&d_yuan-ti']
+INVADER_SPECIES = ['aliens', 'predators'] + DD_MONSTERS
+# HQ order of the task 2 skeleton tables
+HQ_NAMES = ['DE-Headquarter', 'US-Headquarter', 'UK-Headquarter', 'Ocean-Headquarter',
+            'BRA-Headquarter', 'CAN-Headquarter', 'COL-Headquarter', 'IND-Headquarter',
+            'MEX-Headquarter', 'NLD-Headquarter', 'NOR-Headquarter', 'PAK-Headquarter',
+            'TUR-Headquarter', 'UAE-Headquarter', 'ARG-Headquarter', 'Aircraft-Headquarter']
 
 @dataclass
 class Contact:
@@ -63,8 +77,7 @@ class InvaderDatabase:
                     self.country_hq[country_hq.country_code] = country_hq
 
     def create_invader_info(self):
-        dd_monsters = ['d&d_beholder', 'd&d_devil', 'd&d_lich', 'd&d_mind_flayer', 'd&d_vampire', 
-                       'd&d_red_dragon', 'd&d_hill_giant', 'd&d_treant', 'd&d_werewolf', 'd&d_yuan-ti']
+        dd_monsters = DD_MONSTERS
         roles = ['attack', 'defense', 'healing']
         
         for country_code, country in self.country_hq.items():
@@ -86,37 +99,71 @@ class InvaderDatabase:
         for info in self.invader_info:
             info.email = info.email.replace('capatain', 'captain')
 
-    def write_invader_info_to_csv(self, file_path: str):
+    def iter_invader_info_rows(self, sort_by: Optional[Sequence[str]] = None,
+                               memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                               tmp_dir: Optional[str] = None):
+        rows = ((info.country_code, info.invader_species, info.role, info.email)
+                for info in self.invader_info)
+        if not sort_by:
+            return rows
+        indexes = []
+        for column in sort_by:
+            # Accept both the field names and the header spelling, e.g. 'Country_Code'
+            if column.lower() not in INVADER_INFO_FIELDS:
+                raise ValueError(f"Unknown sort column '{column}', expected one of {INVADER_INFO_FIELDS}")
+            indexes.append(INVADER_INFO_FIELDS.index(column.lower()))
+        key = itemgetter(*indexes)
+        return external_sort(rows, key=key, memory_limit=memory_limit, tmp_dir=tmp_dir)
+
+    def write_invader_info_to_csv(self, file_path: str, sort_by: Optional[Sequence[str]] = None,
+                                  memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                                  tmp_dir: Optional[str] = None, delimiter: str = ','):
+        # Build the rows first so a bad sort_by fails before the output file is truncated
+        rows = self.iter_invader_info_rows(sort_by, memory_limit, tmp_dir)
         with open(file_path, 'w', newline='', encoding='utf-8') as csvfile:
-            fieldnames = ['Country_Code', 'Invader_Species', 'Role', 'Email']
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-
-            writer.writeheader()
-            for info in self.invader_info:
-                writer.writerow({
-                    'Country_Code': info.country_code,
-                    'Invader_Species': info.invader_species,
-                    'Role': info.role,
-                    'Email': info.email
-                })
+            writer = csv.writer(csvfile, delimiter=delimiter)
+            writer.writerow(INVADER_INFO_HEADER)
+            writer.writerows(rows)
+
+    def write_invader_info_to_tsv(self, file_path: str, sort_by: Optional[Sequence[str]] = None,
+                                  memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                                  tmp_dir: Optional[str] = None):
+        self.write_invader_info_to_csv(file_path, sort_by, memory_limit, tmp_dir, delimiter='\t')
 
     def get_unique_emails(self):
         return list(set(info.email for info in self.invader_info))
 
-    def create_email_specific_csv(self, mail: str, output_folder: str):
-        os.makedirs(output_folder, exist_ok=True)
-        all_hq_names = list(self.contacts.keys())
-        all_invaders = list(set(contact.invader for contacts in self.contacts.values() for contact in contacts))
+    def get_email_matrix(self, mail: str):
+        # Fixed row and column order, so regenerated tables only change when the data does
+        all_hq_names = [hq for hq in HQ_NAMES if hq in self.contacts]
+        all_hq_names += sorted(set(self.contacts) - set(HQ_NAMES))
+        known_invaders = set(contact.invader for contacts in self.contacts.values() for contact in contacts)
+        all_invaders = [invader for invader in INVADER_SPECIES if invader in known_invaders]
+        all_invaders += sorted(known_invaders - set(INVADER_SPECIES))
 
         matrix = {hq: {invader: set() for invader in all_invaders} for hq in all_hq_names}
-        mail_prefix = mail.split('@')[0]
+        # Apply the same 'capatain' correction as create_invader_info before comparing
+        mail_prefix = mail.replace('capatain', 'captain').split('@')[0]
 
         for hq_name, contacts in self.contacts.items():
             for contact in contacts:
                 for role in ['attack', 'defense', 'healing']:
-                    if getattr(contact, role).split('@')[0] == mail_prefix:
+                    if getattr(contact, role).replace('capatain', 'captain').split('@')[0] == mail_prefix:
                         matrix[hq_name][contact.invader].add(role[0].upper())
 
+        return mail_prefix, all_hq_names, all_invaders, matrix
+
+    def get_lite_email_matrix(self, mail: str):
+        mail_prefix, all_hq_names, all_invaders, matrix = self.get_email_matrix(mail)
+        # Drop HQs and invaders without any role, as in the README's lite-form table
+        hq_names = [hq for hq in all_hq_names if any(matrix[hq].values())]
+        invaders = [invader for invader in all_invaders if any(matrix[hq][invader] for hq in hq_names)]
+        return mail_prefix, hq_names, invaders, matrix
+
+    def create_email_specific_csv(self, mail: str, output_folder: str):
+        os.makedirs(output_folder, exist_ok=True)
+        mail_prefix, all_hq_names, all_invaders, matrix = self.get_email_matrix(mail)
+
         valid_filename = "".join(c for c in mail_prefix if c.isalnum() or c in (' ', '.', '_')).rstrip()
         output_file_path = os.path.join(output_folder, f"{valid_filename}.csv")
 
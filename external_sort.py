@@ -0,0 +1,96 @@
+import os
+import csv
+import heapq
+import sys
+import shutil
+import tempfile
+from contextlib import ExitStack
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+# Default in-memory budget per sorted run, in bytes of buffered Python objects
+DEFAULT_MEMORY_LIMIT = 64 * 1024 * 1024
+# Maximum number of runs opened at once by a single merge
+DEFAULT_MAX_FAN_IN = 64
+POINTER_SIZE = 8  # The buffer's own slot for each row
+
+
+def _estimate_row_size(row: List[str]) -> int:
+    return POINTER_SIZE + sys.getsizeof(row) + sum(sys.getsizeof(field) for field in row)
+
+
+def _write_run(rows: Iterable[Sequence[str]], run_dir: str) -> str:
+    fd, run_path = tempfile.mkstemp(suffix='.csv', dir=run_dir)
+    with open(fd, 'w', newline='', encoding='utf-8') as run_file:
+        csv.writer(run_file).writerows(rows)
+    return run_path
+
+
+def _merge_runs(run_paths: List[str], key: Optional[Callable], run_dir: str) -> str:
+    with ExitStack() as stack:
+        readers = [csv.reader(stack.enter_context(open(path, 'r', newline='', encoding='utf-8')))
+                   for path in run_paths]
+        merged_path = _write_run(heapq.merge(*readers, key=key), run_dir)
+    for path in run_paths:
+        os.remove(path)
+    return merged_path
+
+
+def external_sort(rows: Iterable[Sequence[str]], key: Optional[Callable] = None,
+                  memory_limit: int = DEFAULT_MEMORY_LIMIT,
+                  tmp_dir: Optional[str] = None,
+                  max_fan_in: int = DEFAULT_MAX_FAN_IN) -> Iterator[List[str]]:
+    """Yield rows sorted by key, spilling sorted runs to disk once memory_limit is exceeded.
+
+    Runs are closed after they are written and k-way merged with heapq.merge, at most
+    max_fan_in at a time, so the number of open files stays bounded at any data size.
+    If everything fits in a single run, no temporary files are written. memory_limit is
+    compared against sys.getsizeof of each buffered row list and its fields.
+    """
+    if memory_limit <= 0:
+        raise ValueError(f"memory_limit must be positive, got {memory_limit}")
+    if max_fan_in < 2:
+        raise ValueError(f"max_fan_in must be at least 2, got {max_fan_in}")
+    # Arguments are checked eagerly, before the caller opens any output
+    return _external_sort(rows, key, memory_limit, tmp_dir, max_fan_in)
+
+
+def _external_sort(rows, key, memory_limit, tmp_dir, max_fan_in):
+    run_dir = None
+    run_paths = []
+    buffer = []
+    buffer_size = 0
+
+    try:
+        for row in rows:
+            row = list(row)
+            buffer.append(row)
+            buffer_size += _estimate_row_size(row)
+            if buffer_size >= memory_limit:
+                if run_dir is None:
+                    run_dir = tempfile.mkdtemp(prefix='external_sort_', dir=tmp_dir)
+                buffer.sort(key=key)
+                run_paths.append(_write_run(buffer, run_dir))
+                buffer = []
+                buffer_size = 0
+
+        buffer.sort(key=key)
+        if not run_paths:
+            yield from buffer
+            return
+
+        if buffer:
+            run_paths.append(_write_run(buffer, run_dir))
+            buffer = []
+
+        # Merge in passes until the remaining runs fit into one final merge
+        while len(run_paths) > max_fan_in:
+            run_paths = [_merge_runs(run_paths[start:start + max_fan_in], key, run_dir)
+                         for start in range(0, len(run_paths), max_fan_in)]
+
+        with ExitStack() as stack:
+            readers = [csv.reader(stack.enter_context(open(path, 'r', newline='', encoding='utf-8')))
+                       for path in run_paths]
+            yield from heapq.merge(*readers, key=key)
+    finally:
+        if run_dir is not None:
+            shutil.rmtree(run_dir, ignore_errors=True)
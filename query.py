@@ -0,0 +1,315 @@
+import json
+import heapq
+from collections import Counter
+from array import array
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlparse, parse_qs
+
+from dataextract import InvaderDatabase
+
+FACETS = ['country', 'species', 'role', 'email', 'hq']
+# Facets with a small, fixed set of values; only these get per-value bitsets, since a
+# bitset is as wide as the whole table and country/email values grow with the data
+BITSET_FACETS = ['species', 'role', 'hq']
+
+
+def intersect_ids(id_arrays: Sequence[array]) -> array:
+    if not id_arrays:
+        return array('I')
+    id_arrays = sorted(id_arrays, key=len)
+    result = id_arrays[0]
+    for ids in id_arrays[1:]:
+        matched = array('I')
+        lo = 0
+        for row_id in result:
+            lo = bisect_left(ids, row_id, lo)
+            if lo == len(ids):
+                break
+            if ids[lo] == row_id:
+                matched.append(row_id)
+        result = matched
+        if not result:
+            break
+    return result
+
+
+def ids_to_bitset(ids: array, size: int) -> int:
+    bits = bytearray((size + 7) // 8)
+    for row_id in ids:
+        bits[row_id >> 3] |= 1 << (row_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def union_ids(id_arrays: Sequence[array]) -> array:
+    result = array('I')
+    for row_id in heapq.merge(*id_arrays):
+        if not result or result[-1] != row_id:
+            result.append(row_id)
+    return result
+
+
+class InvaderQueryIndex:
+    """Inverted indexes over InvaderDatabase.invader_info for faceted filtering.
+
+    Each facet value maps to a sorted array of row ids. Values within a facet are
+    OR-ed (union) and facets are AND-ed (intersection), so a query never scans the rows.
+    Low-cardinality facets also keep a bitset per value, so their counts are one AND and
+    a popcount; country and email are counted from the ids matching the other facets.
+    """
+
+    def __init__(self, db: InvaderDatabase):
+        self.db = db
+        self.rows = []
+        self.indexes: Dict[str, Dict[str, array]] = {facet: {} for facet in FACETS}
+
+        hq_attribute = {'aliens': 'aliens', 'predators': 'predators'}
+        for row_id, info in enumerate(db.invader_info):
+            country = db.country_hq[info.country_code]
+            hq_name = getattr(country, hq_attribute.get(info.invader_species, 'dd_monsters'))
+            row = {
+                'country': info.country_code,
+                'species': info.invader_species,
+                'role': info.role,
+                'email': info.email,
+                'hq': hq_name,
+            }
+            self.rows.append(row)
+            # Row ids are appended in increasing order, so every array stays sorted
+            for facet in FACETS:
+                self.indexes[facet].setdefault(row[facet], array('I')).append(row_id)
+
+        self.all_ids = array('I', range(len(self.rows)))
+        self.bitsets: Dict[str, Dict[str, int]] = {
+            facet: {value: ids_to_bitset(ids, len(self.rows)) for value, ids in self.indexes[facet].items()}
+            for facet in BITSET_FACETS
+        }
+
+    def _facet_ids(self, facet: str, values: Sequence[str]) -> array:
+        index = self.indexes[facet]
+        id_arrays = [index[value] for value in set(values) if value in index]
+        if len(id_arrays) == 1:
+            return id_arrays[0]
+        return union_ids(id_arrays)
+
+    def _match(self, filters: Dict[str, Sequence[str]], exclude: Optional[str] = None) -> array:
+        # May return one of the index arrays itself; callers must not modify the result
+        id_arrays = []
+        for facet, values in filters.items():
+            if facet not in self.indexes:
+                raise KeyError(f"Unknown facet '{facet}', expected one of {FACETS}")
+            if facet == exclude or not values:
+                continue
+            id_arrays.append(self._facet_ids(facet, values))
+        if not id_arrays:
+            return self.all_ids
+        return intersect_ids(id_arrays)
+
+    def match(self, filters: Dict[str, Sequence[str]], exclude: Optional[str] = None) -> array:
+        return array('I', self._match(filters, exclude))
+
+    def _match_bitset(self, filters: Dict[str, Sequence[str]], exclude: str,
+                      other_bits: Optional[int]) -> Optional[int]:
+        # None stands for "every row", like _match() returning all_ids
+        result = other_bits
+        for facet in BITSET_FACETS:
+            values = filters.get(facet)
+            if facet == exclude or not values:
+                continue
+            facet_bits = 0
+            for value in values:
+                facet_bits |= self.bitsets[facet].get(value, 0)
+            result = facet_bits if result is None else result & facet_bits
+        return result
+
+    def facet_counts(self, filters: Dict[str, Sequence[str]]) -> Dict[str, Dict[str, int]]:
+        # Each facet is counted against the other facets' filters only,
+        # so picking one value does not hide its alternatives
+        for facet in filters:
+            if facet not in self.indexes:
+                raise KeyError(f"Unknown facet '{facet}', expected one of {FACETS}")
+        # Filters on the other facets are turned into one bitset, shared by all bitset facets
+        other_filters = {facet: values for facet, values in filters.items()
+                         if facet not in BITSET_FACETS and values}
+        other_bits = ids_to_bitset(self._match(other_filters), len(self.rows)) if other_filters else None
+
+        counts = {}
+        for facet in FACETS:
+            if facet in BITSET_FACETS:
+                base_bits = self._match_bitset(filters, facet, other_bits)
+                if base_bits is None:
+                    value_counts = {value: len(ids) for value, ids in self.indexes[facet].items()}
+                else:
+                    value_counts = {value: (bits & base_bits).bit_count()
+                                    for value, bits in self.bitsets[facet].items()}
+            else:
+                base_ids = self._match(filters, exclude=facet)
+                if len(base_ids) == len(self.rows):
+                    value_counts = {value: len(ids) for value, ids in self.indexes[facet].items()}
+                else:
+                    value_counts = Counter(self.rows[row_id][facet] for row_id in base_ids)
+            counts[facet] = {value: count for value, count in sorted(value_counts.items()) if count}
+        return counts
+
+    def query(self, filters: Dict[str, Sequence[str]], page: int = 1, page_size: int = 50) -> dict:
+        ids = self._match(filters)
+        page = max(page, 1)
+        page_size = max(page_size, 1)
+        start = (page - 1) * page_size
+        return {
+            'total': len(ids),
+            'page': page,
+            'page_size': page_size,
+            'rows': [self.rows[row_id] for row_id in ids[start:start + page_size]],
+            'facets': self.facet_counts(filters),
+        }
+
+
+DASHBOARD_HTML = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Avengers vs Invaders</title>
+<style>
+body { font-family: sans-serif; display: flex; gap: 2em; }
+select { display: block; width: 16em; margin-bottom: 1em; }
+td, th { padding: 0 1em; text-align: left; }
+</style>
+</head>
+<body>
+<nav id="facets"></nav>
+<main>
+<p><button id="prev">&lt;</button> <span id="status"></span> <button id="next">&gt;</button></p>
+<table><thead><tr><th>country</th><th>species</th><th>role</th><th>email</th><th>hq</th></tr></thead>
+<tbody id="rows"></tbody></table>
+</main>
+<script>
+const FACETS = ["country", "species", "role", "email", "hq"];
+const selected = {};
+let page = 1;
+
+function text(tag, value) {
+  const el = document.createElement(tag);
+  el.textContent = value;
+  return el;
+}
+
+async function refresh() {
+  const params = new URLSearchParams({page: page});
+  for (const facet of FACETS) {
+    for (const value of selected[facet] || []) params.append(facet, value);
+  }
+  const result = await (await fetch("/api/query?" + params)).json();
+  const pages = Math.max(1, Math.ceil(result.total / result.page_size));
+  document.getElementById("status").textContent =
+    result.total + " rows, page " + result.page + " of " + pages;
+
+  const nav = document.getElementById("facets");
+  nav.replaceChildren();
+  for (const facet of FACETS) {
+    const chosen = selected[facet] || [];
+    const header = document.createElement("div");
+    header.appendChild(text("label", facet + " "));
+    const clear = text("button", "clear");
+    clear.disabled = chosen.length === 0;
+    clear.onclick = () => {
+      selected[facet] = [];
+      page = 1;
+      refresh();
+    };
+    header.appendChild(clear);
+    nav.appendChild(header);
+
+    // Zero-count values are left out of the counts, but selected ones must stay visible
+    // so they can still be deselected
+    const counts = Object.assign({}, result.facets[facet]);
+    for (const value of chosen) {
+      if (!(value in counts)) counts[value] = 0;
+    }
+    const select = document.createElement("select");
+    select.multiple = true;
+    select.size = 6;
+    for (const value of Object.keys(counts).sort()) {
+      const option = text("option", value + " (" + counts[value] + ")");
+      option.value = value;
+      option.selected = chosen.includes(value);
+      select.appendChild(option);
+    }
+    select.onchange = () => {
+      selected[facet] = Array.from(select.selectedOptions, option => option.value);
+      page = 1;
+      refresh();
+    };
+    nav.appendChild(select);
+  }
+
+  const body = document.getElementById("rows");
+  body.replaceChildren();
+  for (const row of result.rows) {
+    const tr = document.createElement("tr");
+    for (const facet of FACETS) tr.appendChild(text("td", row[facet]));
+    body.appendChild(tr);
+  }
+  document.getElementById("prev").onclick = () => { if (page > 1) { page--; refresh(); } };
+  document.getElementById("next").onclick = () => { if (page < pages) { page++; refresh(); } };
+}
+
+refresh();
+</script>
+</body>
+</html>
+"""
+
+
+def make_handler(index: InvaderQueryIndex):
+    class QueryHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, content_type: str, body: str):
+            payload = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == '/':
+                self._send(200, 'text/html; charset=utf-8', DASHBOARD_HTML)
+            elif url.path == '/api/query':
+                params = parse_qs(url.query)
+                filters = {facet: params[facet] for facet in FACETS if facet in params}
+                try:
+                    page = int(params.get('page', ['1'])[0])
+                    page_size = int(params.get('page_size', ['50'])[0])
+                except ValueError:
+                    self._send(400, 'application/json', json.dumps({'error': 'page and page_size must be integers'}))
+                    return
+                result = index.query(filters, page, page_size)
+                self._send(200, 'application/json', json.dumps(result))
+            else:
+                self._send(404, 'text/plain', 'Not found')
+
+    return QueryHandler
+
+
+def serve(index: InvaderQueryIndex, host: str = '127.0.0.1', port: int = 8000):
+    server = ThreadingHTTPServer((host, port), make_handler(index))
+    print(f"Dashboard is being served at http://{host}:{port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    db = InvaderDatabase()
+    db.extract_members_to_dict("Option2_Tab_Delimited_Text/country_hq.txt")
+    db.gather_all_contacts("Option2_Tab_Delimited_Text/contacts")
+    db.create_invader_info()
+    serve(InvaderQueryIndex(db))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+import os
+import html
+from itertools import islice
+from typing import Optional, Sequence
+
+from dataextract import InvaderDatabase, INVADER_INFO_HEADER
+
+
+class MarkdownTableWriter:
+    extension = '.md'
+
+    def __init__(self, file):
+        self.file = file
+
+    @staticmethod
+    def _cell(value: str) -> str:
+        return value.replace('|', '\\|')
+
+    def begin_page(self, title: str):
+        self.file.write(f"# {title}\n\n")
+
+    def end_page(self):
+        pass
+
+    def write_heading(self, text: str):
+        self.file.write(f"## {text}\n\n")
+
+    def begin_table(self, header: Sequence[str]):
+        self.file.write('| ' + ' | '.join(self._cell(h) for h in header) + ' |\n')
+        self.file.write('| ' + ' | '.join(':---' for _ in header) + ' |\n')
+
+    def write_row(self, row: Sequence[str]):
+        self.file.write('| ' + ' | '.join(self._cell(value) for value in row) + ' |\n')
+
+    def end_table(self):
+        self.file.write('\n')
+
+    def write_link(self, text: str, href: str):
+        self.file.write(f"* [{text}]({href})\n")
+
+    def end_links(self):
+        self.file.write('\n')
+
+
+class HtmlTableWriter:
+    extension = '.html'
+
+    def __init__(self, file):
+        self.file = file
+
+    def begin_page(self, title: str):
+        self.file.write(f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+                        f"<title>{html.escape(title)}</title>\n</head>\n<body>\n"
+                        f"<h1>{html.escape(title)}</h1>\n")
+
+    def end_page(self):
+        self.file.write("</body>\n</html>\n")
+
+    def write_heading(self, text: str):
+        self.file.write(f"<h2>{html.escape(text)}</h2>\n")
+
+    def begin_table(self, header: Sequence[str]):
+        self.file.write('<table>\n<tr>' + ''.join(f"<th>{html.escape(h)}</th>" for h in header) + '</tr>\n')
+
+    def write_row(self, row: Sequence[str]):
+        self.file.write('<tr>' + ''.join(f"<td>{html.escape(value)}</td>" for value in row) + '</tr>\n')
+
+    def end_table(self):
+        self.file.write('</table>\n')
+
+    def write_link(self, text: str, href: str):
+        self.file.write(f"<p><a href=\"{html.escape(href)}\">{html.escape(text)}</a></p>\n")
+
+    def end_links(self):
+        pass
+
+
+TABLE_WRITERS = {
+    'markdown': MarkdownTableWriter,
+    'html': HtmlTableWriter,
+}
+
+
+class ReportGenerator:
+    """Stream task 1 and task 2 tables from an InvaderDatabase into paged report files.
+
+    Rows are written as they are produced, so no page is ever built as a single string.
+    Each page holds at most rows_per_page lookup rows or heroes_per_page hero tables,
+    and an index page links to all of them.
+    """
+
+    def __init__(self, db: InvaderDatabase, output_folder: str, fmt: str = 'markdown',
+                 rows_per_page: int = 1000, heroes_per_page: int = 10,
+                 sort_by: Optional[Sequence[str]] = None):
+        if fmt not in TABLE_WRITERS:
+            raise ValueError(f"Unknown report format '{fmt}', expected one of {sorted(TABLE_WRITERS)}")
+        if rows_per_page < 1:
+            raise ValueError(f"rows_per_page must be at least 1, got {rows_per_page}")
+        if heroes_per_page < 1:
+            raise ValueError(f"heroes_per_page must be at least 1, got {heroes_per_page}")
+        self.db = db
+        self.output_folder = output_folder
+        self.writer_class = TABLE_WRITERS[fmt]
+        self.rows_per_page = rows_per_page
+        self.heroes_per_page = heroes_per_page
+        self.sort_by = sort_by
+
+    def _page_name(self, prefix: str, page_number: int) -> str:
+        return f"{prefix}_{page_number:03d}{self.writer_class.extension}"
+
+    def _open_page(self, page_name: str):
+        return open(os.path.join(self.output_folder, page_name), 'w', encoding='utf-8')
+
+    def write_task1_pages(self):
+        pages = []
+        rows = iter(self.db.iter_invader_info_rows(self.sort_by))
+        while True:
+            chunk = list(islice(rows, self.rows_per_page))
+            if not chunk and pages:
+                break
+            page_name = self._page_name('task1', len(pages) + 1)
+            title = f"Task 1: Lookup Table (page {len(pages) + 1})"
+            with self._open_page(page_name) as file:
+                writer = self.writer_class(file)
+                writer.begin_page(title)
+                writer.begin_table(INVADER_INFO_HEADER)
+                for row in chunk:
+                    writer.write_row(row)
+                writer.end_table()
+                writer.end_page()
+            pages.append((title, page_name))
+            if len(chunk) < self.rows_per_page:
+                break
+        return pages
+
+    def write_task2_pages(self):
+        pages = []
+        emails = sorted(self.db.get_unique_emails())
+        for start in range(0, len(emails), self.heroes_per_page):
+            page_emails = emails[start:start + self.heroes_per_page]
+            page_name = self._page_name('task2', len(pages) + 1)
+            first, last = page_emails[0].split('@')[0], page_emails[-1].split('@')[0]
+            hero_range = first if first == last else f"{first} - {last}"
+            title = f"Task 2: Hero Role Tables ({hero_range})"
+            with self._open_page(page_name) as file:
+                writer = self.writer_class(file)
+                writer.begin_page(title)
+                for email in page_emails:
+                    mail_prefix, hq_names, invaders, matrix = self.db.get_lite_email_matrix(email)
+                    if not hq_names:
+                        print(f"Warning: no roles found for {mail_prefix}, skipping its table")
+                        continue
+                    writer.write_heading(mail_prefix)
+                    writer.begin_table([mail_prefix] + invaders)
+                    for hq in hq_names:
+                        writer.write_row([hq] + [''.join(sorted(matrix[hq][invader])) for invader in invaders])
+                    writer.end_table()
+                writer.end_page()
+            pages.append((title, page_name))
+        return pages
+
+    def generate(self) -> str:
+        os.makedirs(self.output_folder, exist_ok=True)
+        task1_pages = self.write_task1_pages()
+        task2_pages = self.write_task2_pages()
+
+        index_name = f"index{self.writer_class.extension}"
+        with self._open_page(index_name) as file:
+            writer = self.writer_class(file)
+            writer.begin_page("Avengers vs Invaders")
+            for heading, pages in (("Task 1", task1_pages), ("Task 2", task2_pages)):
+                writer.write_heading(heading)
+                for title, page_name in pages:
+                    writer.write_link(title, page_name)
+                writer.end_links()
+            writer.end_page()
+
+        return os.path.join(self.output_folder, index_name)
+
+
+def main():
+    db = InvaderDatabase()
+    db.extract_members_to_dict("Option2_Tab_Delimited_Text/country_hq.txt")
+    db.gather_all_contacts("Option2_Tab_Delimited_Text/contacts")
+    db.create_invader_info()
+
+    sort_by = ['country_code', 'invader_species', 'role']
+    for fmt, output_folder in (('markdown', 'report_markdown'), ('html', 'report_html')):
+        index_path = ReportGenerator(db, output_folder, fmt, sort_by=sort_by).generate()
+        print(f"{fmt} report has been written to {index_path}")
+
+if __name__ == "__main__":
+    main()
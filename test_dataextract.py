@@ -0,0 +1,95 @@
+import os
+import csv
+
+import pytest
+
+from dataextract import InvaderDatabase, Contact, INVADER_SPECIES, HQ_NAMES
+
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Option2_Tab_Delimited_Text')
+
+
+@pytest.fixture(scope='module')
+def db():
+    db = InvaderDatabase()
+    db.extract_members_to_dict(os.path.join(DATA_FOLDER, 'country_hq.txt'))
+    db.gather_all_contacts(os.path.join(DATA_FOLDER, 'contacts'))
+    db.create_invader_info()
+    return db
+
+
+def read_rows(file_path, delimiter=','):
+    with open(file_path, newline='', encoding='utf-8') as file:
+        return list(csv.reader(file, delimiter=delimiter))
+
+
+def test_sorted_csv_matches_in_memory_sort(db, tmp_path):
+    output = tmp_path / 'invader_info.csv'
+    db.write_invader_info_to_csv(str(output), sort_by=['country_code', 'invader_species', 'role'],
+                                 memory_limit=2000, tmp_dir=str(tmp_path))
+    rows = read_rows(output)
+    expected = sorted(([info.country_code, info.invader_species, info.role, info.email]
+                       for info in db.invader_info), key=lambda row: row[:3])
+    assert rows[0] == ['Country_Code', 'Invader_Species', 'Role', 'Email']
+    assert rows[1:] == expected
+
+
+def test_sort_by_accepts_header_spelling(db, tmp_path):
+    output = tmp_path / 'invader_info.tsv'
+    db.write_invader_info_to_tsv(str(output), sort_by=['Email', 'Country_Code'])
+    rows = read_rows(output, delimiter='\t')[1:]
+    assert rows == sorted(rows, key=lambda row: (row[3], row[0]))
+
+
+@pytest.mark.parametrize('kwargs', [{'sort_by': ['hq']}, {'sort_by': ['role'], 'memory_limit': 0}])
+def test_invalid_sort_arguments_keep_existing_file(db, tmp_path, kwargs):
+    output = tmp_path / 'invader_info.csv'
+    output.write_text('previous output\n')
+    with pytest.raises(ValueError):
+        db.write_invader_info_to_csv(str(output), **kwargs)
+    assert output.read_text() == 'previous output\n'
+
+
+def test_lite_matrix_matches_readme_example(db):
+    mail_prefix, hq_names, invaders, matrix = db.get_lite_email_matrix('iron.man@avengers.com')
+    assert mail_prefix == 'iron.man'
+    assert hq_names == ['DE-Headquarter']
+    assert invaders == ['aliens']
+    assert matrix['DE-Headquarter']['aliens'] == {'A'}
+
+
+def test_lite_matrix_drops_only_empty_rows_and_columns(db):
+    for email in db.get_unique_emails():
+        _, all_hq_names, all_invaders, matrix = db.get_email_matrix(email)
+        _, hq_names, invaders, _ = db.get_lite_email_matrix(email)
+        assert hq_names, f"{email} has an empty lite table"
+        assert hq_names == [hq for hq in all_hq_names if any(matrix[hq].values())]
+        assert invaders == [invader for invader in all_invaders
+                            if any(matrix[hq][invader] for hq in all_hq_names)]
+
+
+def test_email_matrix_corrects_capatain_typo(db):
+    _, hq_names, _, matrix = db.get_lite_email_matrix('captain.america@avengers.com')
+    assert set(hq_names) == {'DE-Headquarter', 'Aircraft-Headquarter'}
+    cells = [roles for hq in hq_names for roles in matrix[hq].values() if roles]
+    assert cells == [{'A', 'D', 'H'}] * 6
+
+
+def test_email_matrix_order_is_fixed(db):
+    _, all_hq_names, all_invaders, _ = db.get_email_matrix('thor@avengers.com')
+    assert all_invaders == INVADER_SPECIES
+    assert all_hq_names == HQ_NAMES
+
+
+def test_task2_skeleton_hq_order(db):
+    with open(os.path.join(DATA_FOLDER, 'task2', 'iron.man.txt')) as file:
+        skeleton_hq_names = [line.split('\t')[0].strip() for line in file][1:]
+    assert db.get_email_matrix('iron.man@avengers.com')[1] == skeleton_hq_names
+
+
+def test_unknown_hqs_are_appended_sorted(db):
+    contacts = dict(db.contacts)
+    contacts['ZZ-Headquarter'] = [Contact('ZZ-Headquarter', 'aliens', 'thor')]
+    contacts['AA-Headquarter'] = [Contact('AA-Headquarter', 'aliens', 'thor')]
+    extended_db = InvaderDatabase(db.country_hq, contacts, db.invader_info)
+    _, all_hq_names, _, _ = extended_db.get_email_matrix('thor@avengers.com')
+    assert all_hq_names == HQ_NAMES + ['AA-Headquarter', 'ZZ-Headquarter']
@@ -0,0 +1,67 @@
+import os
+import random
+from operator import itemgetter
+
+import pytest
+
+from external_sort import external_sort, _estimate_row_size
+
+
+def make_rows(count, seed=0):
+    rng = random.Random(seed)
+    return [[rng.choice('abcdefgh'), f"{rng.randrange(1000):03d}", str(i)] for i in range(count)]
+
+
+def test_spilled_runs_merge_in_sorted_order(tmp_path):
+    rows = make_rows(2000)
+    key = itemgetter(0, 1)
+    result = list(external_sort(rows, key=key, memory_limit=500, tmp_dir=str(tmp_path)))
+    assert result == sorted(rows, key=key)
+    assert os.listdir(tmp_path) == []
+
+
+def test_multi_pass_merge_with_small_fan_in(tmp_path):
+    rows = make_rows(3000, seed=1)
+    result = list(external_sort(rows, memory_limit=100, tmp_dir=str(tmp_path), max_fan_in=3))
+    assert result == sorted(rows)
+    assert os.listdir(tmp_path) == []
+
+
+def test_in_memory_sort_without_spilling(tmp_path):
+    rows = make_rows(50, seed=2)
+    assert list(external_sort(rows, tmp_dir=str(tmp_path))) == sorted(rows)
+    assert os.listdir(tmp_path) == []
+
+
+def test_open_files_stay_bounded(tmp_path):
+    resource = pytest.importorskip('resource')
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (128, hard))
+    try:
+        rows = make_rows(6336, seed=3)
+        result = list(external_sort(rows, memory_limit=100, tmp_dir=str(tmp_path)))
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+    assert result == sorted(rows)
+
+
+@pytest.mark.parametrize('memory_limit', [0, -1])
+def test_rejects_non_positive_memory_limit(memory_limit):
+    with pytest.raises(ValueError):
+        list(external_sort([['a']], memory_limit=memory_limit))
+
+
+def test_row_size_estimate_tracks_actual_memory():
+    tracemalloc = pytest.importorskip('tracemalloc')
+    rows = make_rows(5000, seed=4)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        buffer = []
+        for row in rows:
+            buffer.append([f"{field}@avengers.com" for field in row])
+        actual = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    estimate = sum(_estimate_row_size(row) for row in buffer)
+    assert 0.8 * actual <= estimate <= 1.25 * actual
@@ -0,0 +1,112 @@
+import os
+import random
+from array import array
+from collections import Counter
+
+import pytest
+
+from dataextract import InvaderDatabase, InvaderInfo, CountryHQ
+from query import InvaderQueryIndex, FACETS, BITSET_FACETS
+
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Option2_Tab_Delimited_Text')
+
+
+@pytest.fixture(scope='module')
+def index():
+    db = InvaderDatabase()
+    db.extract_members_to_dict(os.path.join(DATA_FOLDER, 'country_hq.txt'))
+    db.gather_all_contacts(os.path.join(DATA_FOLDER, 'contacts'))
+    db.create_invader_info()
+    return InvaderQueryIndex(db)
+
+
+def brute_force_ids(index, filters, exclude=None):
+    return [row_id for row_id, row in enumerate(index.rows)
+            if all(row[facet] in values for facet, values in filters.items()
+                   if facet != exclude and values)]
+
+
+def random_filters(index, rng):
+    filters = {}
+    for facet in FACETS:
+        if rng.random() < 0.5:
+            values = rng.sample(sorted(index.indexes[facet]), rng.randint(1, 3))
+            if rng.random() < 0.1:
+                values.append('no-such-value')
+            filters[facet] = values
+    return filters
+
+
+def test_match_and_facet_counts_against_brute_force(index):
+    rng = random.Random(0)
+    for _ in range(100):
+        filters = random_filters(index, rng)
+        assert list(index.match(filters)) == brute_force_ids(index, filters)
+
+        counts = index.facet_counts(filters)
+        for facet in FACETS:
+            expected = Counter(index.rows[row_id][facet]
+                               for row_id in brute_force_ids(index, filters, exclude=facet))
+            assert counts[facet] == dict(sorted(expected.items()))
+
+
+def test_query_paginates_matching_rows(index):
+    filters = {'country': ['germany', 'france'], 'role': ['attack_role', 'attack_role']}
+    expected = [index.rows[row_id] for row_id in brute_force_ids(index, filters)]
+    result = index.query(filters, page=2, page_size=5)
+    assert result['total'] == len(expected)
+    assert result['rows'] == expected[5:10]
+    assert index.query(filters, page=100, page_size=5)['rows'] == []
+
+
+def test_empty_filters_match_every_row(index):
+    assert len(index.match({})) == len(index.rows)
+    assert index.facet_counts({'role': []})['role'] == dict(sorted(Counter(row['role'] for row in index.rows).items()))
+
+
+def test_unknown_facet_is_rejected(index):
+    with pytest.raises(KeyError):
+        index.match({'planet': ['earth']})
+    with pytest.raises(KeyError):
+        index.facet_counts({'planet': ['earth']})
+
+
+def synthetic_db(country_count):
+    db = InvaderDatabase()
+    species = ['aliens', 'predators', 'd&d_lich']
+    for number in range(country_count):
+        country_code = f"country_{number}"
+        db.country_hq[country_code] = CountryHQ(country_code, country_code, 'DE-Headquarter',
+                                                'US-Headquarter', 'UK-Headquarter')
+        for invader in species:
+            db.invader_info.append(InvaderInfo(country_code, invader, 'attack_role',
+                                               f"hero_{number % 500}@avengers.com"))
+    return db
+
+
+def test_index_size_grows_linearly_with_many_countries():
+    index = InvaderQueryIndex(synthetic_db(8000))
+    row_count = len(index.rows)
+    assert set(index.bitsets) == set(BITSET_FACETS)
+    bitset_count = sum(len(bitsets) for bitsets in index.bitsets.values())
+    bitset_bytes = sum((bits.bit_length() + 7) // 8 for bitsets in index.bitsets.values()
+                       for bits in bitsets.values())
+    assert bitset_count == 3 + 1 + 3
+    assert bitset_bytes <= bitset_count * (row_count + 7) // 8
+    id_bytes = sum(ids.itemsize * len(ids) for facet_index in index.indexes.values()
+                   for ids in facet_index.values())
+    assert id_bytes == len(FACETS) * row_count * array('I').itemsize
+
+    filters = {'country': ['country_1', 'country_2'], 'species': ['aliens']}
+    expected = Counter(index.rows[row_id]['email'] for row_id in brute_force_ids(index, filters, exclude='email'))
+    assert index.facet_counts(filters)['email'] == dict(sorted(expected.items()))
+
+
+def test_match_result_does_not_alias_the_index(index):
+    germany_ids = list(index.indexes['country']['germany'])
+    for filters in ({}, {'country': ['germany']}):
+        result = index.match(filters)
+        result.append(0)
+        result[0] = len(index.rows)
+    assert list(index.indexes['country']['germany']) == germany_ids
+    assert list(index.all_ids) == list(range(len(index.rows)))
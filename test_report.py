@@ -0,0 +1,76 @@
+import os
+import sys
+import subprocess
+
+import pytest
+
+from dataextract import InvaderDatabase, InvaderInfo
+from report import ReportGenerator
+
+DATA_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Option2_Tab_Delimited_Text')
+
+
+def load_db():
+    db = InvaderDatabase()
+    db.extract_members_to_dict(os.path.join(DATA_FOLDER, 'country_hq.txt'))
+    db.gather_all_contacts(os.path.join(DATA_FOLDER, 'contacts'))
+    db.create_invader_info()
+    return db
+
+
+@pytest.fixture(scope='module')
+def db():
+    return load_db()
+
+
+def read_pages(folder, prefix):
+    text = ''
+    for name in sorted(os.listdir(folder)):
+        if name.startswith(prefix):
+            with open(os.path.join(folder, name), encoding='utf-8') as file:
+                text += file.read()
+    return text
+
+
+def test_markdown_report_pages_and_index(db, tmp_path):
+    index_path = ReportGenerator(db, str(tmp_path), rows_per_page=1000, heroes_per_page=10).generate()
+    assert os.path.basename(index_path) == 'index.md'
+
+    task1 = read_pages(tmp_path, 'task1_')
+    assert task1.count('| Country_Code |') == 7
+    assert sum(1 for line in task1.splitlines() if line.startswith('| ') and
+               not line.startswith(('| Country_Code', '| :---'))) == len(db.invader_info)
+
+    task2 = read_pages(tmp_path, 'task2_')
+    assert '## iron.man\n\n| iron.man | aliens |\n| :--- | :--- |\n| DE-Headquarter | A |\n' in task2
+    assert '## captain.america\n\n| captain.america |' in task2
+
+
+def test_heroes_without_roles_are_skipped(db, tmp_path):
+    sparse_db = InvaderDatabase(db.country_hq, db.contacts,
+                                db.invader_info + [InvaderInfo('germany', 'aliens', 'attack_role', 'nobody@avengers.com')])
+    ReportGenerator(sparse_db, str(tmp_path), fmt='html').generate()
+    task2 = read_pages(tmp_path, 'task2_')
+    assert 'nobody' not in task2
+    assert '<h2>iron.man</h2>' in task2
+
+
+def test_report_is_identical_across_hash_seeds(tmp_path):
+    package_folder = os.path.dirname(os.path.abspath(__file__))
+    script = ("import sys\n"
+              "from report import ReportGenerator\n"
+              "from test_report import load_db\n"
+              "ReportGenerator(load_db(), sys.argv[1]).generate()\n")
+    outputs = []
+    for seed in ('1', '2'):
+        output_folder = str(tmp_path / seed)
+        env = dict(os.environ, PYTHONHASHSEED=seed)
+        subprocess.run([sys.executable, '-c', script, output_folder], cwd=package_folder, env=env, check=True)
+        outputs.append(read_pages(output_folder, 'task2_'))
+    assert outputs[0] == outputs[1]
+
+
+@pytest.mark.parametrize('kwargs', [{'rows_per_page': 0}, {'heroes_per_page': 0}, {'fmt': 'pdf'}])
+def test_invalid_options_are_rejected(db, tmp_path, kwargs):
+    with pytest.raises(ValueError):
+        ReportGenerator(db, str(tmp_path), **kwargs)